@@ -10,10 +10,34 @@ import argparse
 import json
 import requests
 import sys
-from typing import Any, Dict, List, Optional, Tuple
+import urllib3
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from scraper_common import ConditionalCache, write_json_array
+
+try:
+    import orjson  # optional: faster JSON decoding
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # optional: stream-parse the skills array instead of loading it whole
+except ImportError:
+    ijson = None
+
+# Errors that can surface while the (possibly streamed) skills array is read and decoded
+PARSE_ERRORS: Tuple[type, ...] = (json.JSONDecodeError, urllib3.exceptions.HTTPError)
+if ijson is not None:
+    PARSE_ERRORS += (ijson.JSONError,)
 
 # Base URL for skill icon images (deduced from Gametora structure)
 ICON_BASE_URL = "https://gametora.com/images/umamusume/skill_icons/"
+ICON_BASE_URL_LEN = len(ICON_BASE_URL)
+
+# Shared keep-alive session (pooled connections to gametora)
+SESSION = requests.Session()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32))
+SESSION.headers["Connection"] = "keep-alive"
 
 # --- Rarity Mapping based on User Input ---
 RARITY_MAP = {
@@ -25,6 +49,9 @@ RARITY_MAP = {
     "inherited": ("inherited", "dnlGQR"), 
 }
 
+# Trailing name character -> grade symbol (anything else has no symbol)
+GRADE_SYMBOL_MAP = {"◎": "◎", "○": "○"}
+
 # --------------------------------- Utils ------------------------------------
 def dbg(on: bool, *args, **kwargs):
     """Prints debug messages to stderr if debug is enabled."""
@@ -38,11 +65,7 @@ def get_skill_symbol(name: str) -> Optional[str]:
     Extracts grade symbol (◎, ○) from the skill name.
     Returns None if no symbol is found.
     """
-    if name.endswith("◎"):
-        return "◎"
-    elif name.endswith("○"):
-        return "○"
-    return None # Changed from "" to None
+    return GRADE_SYMBOL_MAP.get(name[-1:]) if name else None
 
 
 def deduce_skill_attributes(skill: Dict[str, Any]) -> Tuple[str, str, Optional[str]]:
@@ -71,72 +94,124 @@ def deduce_skill_attributes(skill: Dict[str, Any]) -> Tuple[str, str, Optional[s
     # Note: We return Optional[str] for grade_symbol now
     return rarity_str, color_class, grade_symbol
 
+def has_required_fields(skill: Dict[str, Any], debug: bool) -> bool:
+    """True if the raw skill has every field the detailed output needs."""
+    get = skill.get
+    if get("id") is None or not get("name_en") or not get("desc_en") or get("iconid") is None:
+        dbg(debug, f"[DEBUG] Skipping skill with missing key data (ID: {get('id')}).")
+        return False
+    return True
+
+
+def format_skill(skill: Dict[str, Any]) -> Dict[str, Any]:
+    """Builds the detailed output object for a raw skill that passed has_required_fields."""
+    # Determine Rarity, Color Class, and Grade Symbol
+    rarity, color_class, grade_symbol = deduce_skill_attributes(skill)
+    
+    # Format Icon URL in one f-string; the filename is its suffix after the base URL
+    icon_src = f"{ICON_BASE_URL}utx_ico_skill_{skill['iconid']}.png"
+    icon_filename = icon_src[ICON_BASE_URL_LEN:]
+    
+    return {
+        "id": skill["id"],
+        "icon_filename": icon_filename,
+        "icon_src": icon_src,
+        "name": skill["name_en"],
+        "description": skill["desc_en"],
+        "color_class": color_class,
+        "rarity": rarity,
+        "grade_symbol": grade_symbol # This will be "◎", "○", or None (which serializes to null)
+    }
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+def open_skills_json(url: str, cache: ConditionalCache, debug: bool) -> BinaryIO:
+    """
+    Returns a readable binary stream of the JSON at `url`.
+
+    A cached copy is revalidated first and reopened on a 304. A fresh body is streamed
+    into the cache and read back from disk; without a usable cache (or if the server
+    sends no validators) the response body is streamed straight off the socket.
+    """
+    cached_path, headers = cache.lookup(url)
+    response = SESSION.get(url, headers=headers, timeout=15, stream=True)
+    if response.status_code == 304 and cached_path:
+        response.close()
+        try:
+            source = open(cached_path, "rb")
+            dbg(debug, f"[DEBUG] Not modified, using cached copy: {cached_path}")
+            return source
+        except OSError as e:
+            print(f"[WARN] Could not read cached copy of {url}, re-downloading: {e}", file=sys.stderr)
+            response = SESSION.get(url, timeout=15, stream=True)
+    response.raise_for_status()
+    response.raw.decode_content = True
+
+    was_caching = cache.enabled
+    cached_path = cache.store(url, response, response.raw)
+    cache.save()
+    if cached_path is not None:
+        response.close()
+        return open(cached_path, "rb")
+    if was_caching and not cache.enabled:
+        # The cache write failed, possibly part-way through the body; fetch it again uncached
+        response.close()
+        response = SESSION.get(url, timeout=15, stream=True)
+        response.raise_for_status()
+        response.raw.decode_content = True
+    return response.raw
+
 # ---------------------------------- Main ------------------------------------
 def main():
     ap = argparse.ArgumentParser(description="Scrape and parse skills.")
     ap.add_argument("--url", type=str, required=True, help="Url find by going to https://gametora.com/umamusume/skills open Inspector->Network select XHR file 'skills.*.json' right click->Copy Value->Copy Url (e.g., https://gametora.com/data/umamusume/skills.81413efc.json)")
     ap.add_argument("--out", default="in_game/skills.json", help="Output JSON file (array of detailed skill objects)")
+    ap.add_argument("--cache-dir", default=".cache", help="Directory for the ETag/Last-Modified cached skills JSON (default: %(default)s)")
+    ap.add_argument("--no-cache", action="store_true", help="Always re-download instead of revalidating the cache")
     ap.add_argument("--debug", action="store_true", help="Enable verbose debug prints to stderr")
     args = ap.parse_args()
 
-    # 1. Fetch the JSON data from the URL
+    # 1. Fetch the JSON data from the URL (revalidating the cached copy if there is one)
     url = args.url
     dbg(args.debug, f"[DEBUG] Attempting to fetch URL: {url}")
     
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+        cache = ConditionalCache(None if args.no_cache else args.cache_dir, args.debug)
+        source = open_skills_json(url, cache, args.debug)
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
         print(f"[ERROR] Failed to fetch URL {url}: {e}", file=sys.stderr)
         return
 
-    # 2. Parse the JSON content
-    try:
-        raw_skills_data: List[Dict[str, Any]] = response.json()
-        dbg(args.debug, f"[DEBUG] Successfully parsed JSON. Found {len(raw_skills_data)} skills.")
-    except json.JSONDecodeError as e:
-        print(f"[ERROR] Failed to decode JSON content: {e}", file=sys.stderr)
-        return
-    
-    # 3. Process and filter/format the data
-    detailed_skills: List[Dict[str, Any]] = []
-    
-    for skill in raw_skills_data:
-        skill_id = skill.get("id")
-        name_en = skill.get("name_en")
-        desc_en = skill.get("desc_en")
-        icon_id = skill.get("iconid")
-
-        if skill_id is None or not name_en or not desc_en or icon_id is None:
-            dbg(args.debug, f"[DEBUG] Skipping skill with missing key data (ID: {skill_id}).")
-            continue
-        
-        # Determine Rarity, Color Class, and Grade Symbol
-        rarity, color_class, grade_symbol = deduce_skill_attributes(skill)
-        
-        # Format Icon Filename and URL
-        icon_filename = f"utx_ico_skill_{icon_id}.png"
-        icon_src = ICON_BASE_URL + icon_filename
+    with source:
+        # 2. Parse the JSON content. With ijson the array is decoded from the stream one
+        #    skill at a time, so only the formatted entries are ever held in memory.
+        raw_skills_data: Iterable[Dict[str, Any]]
+        if ijson is not None:
+            raw_skills_data = ijson.items(source, "item", use_float=True)
+        else:
+            try:
+                raw_skills_data = json_loads(source.read())
+                dbg(args.debug, f"[DEBUG] Successfully parsed JSON. Found {len(raw_skills_data)} skills.")
+            except PARSE_ERRORS as e:
+                print(f"[ERROR] Failed to decode JSON content: {e}", file=sys.stderr)
+                return
         
-        # Build the detailed output object
-        detailed_skills.append({
-            "id": skill_id,
-            "icon_filename": icon_filename,
-            "icon_src": icon_src,
-            "name": name_en,
-            "description": desc_en,
-            "color_class": color_class,
-            "rarity": rarity,
-            "grade_symbol": grade_symbol # This will be "◎", "○", or None (which serializes to null)
-        })
+        # 3. Process and filter/format the data
+        debug = args.debug
+        try:
+            detailed_skills: List[Dict[str, Any]] = [
+                format_skill(skill) for skill in raw_skills_data if has_required_fields(skill, debug)
+            ]
+        except PARSE_ERRORS as e:
+            print(f"[ERROR] Failed to decode JSON content: {e}", file=sys.stderr)
+            return
 
     dbg(args.debug, f"[DEBUG] Formatted {len(detailed_skills)} skills.")
 
     # 4. Save the formatted data to the output JSON file
     try:
-        # json.dump naturally converts Python's None to JSON's null
-        with open(args.out, "w", encoding="utf-8") as f:
-            json.dump(detailed_skills, f, ensure_ascii=False, indent=2)
+        # Both encoders naturally convert Python's None to JSON's null
+        write_json_array(args.out, detailed_skills)
 
         print(f"[OK] Wrote {len(detailed_skills)} detailed skill entries → {args.out}")
     except IOError as e:
@@ -4,18 +4,32 @@
 """
 Scrape UMA MUSUME Event Data from Gametora for multiple support cards,
 parse the embedded Next.js JSON, score options, and output a single file.
+
+Requires:
+  pip install beautifulsoup4 lxml requests
+  (optional) pip install orjson
 """
 
 import argparse
+import io
 import json
 import re 
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 from bs4 import BeautifulSoup
 import requests
 import sys
+import urllib3
 import os 
 import shutil 
 
+from scraper_common import ConditionalCache, write_json_array
+
+try:
+    import orjson  # optional: C decoder, falls back to stdlib json
+except ImportError:
+    orjson = None
+
 # --- Scoring Weights (kept from original script) ---
 W_ENERGY   = 100.0
 W_STAT     = 10.0
@@ -31,28 +45,59 @@ STAT_WEIGHTS = {
     "wit": 2.0,
     "guts": 1.0,
 }
+# Frozen (stat, weight) pairs, iterated once per scored outcome
+STAT_WEIGHT_ITEMS: Tuple[Tuple[str, float], ...] = tuple(STAT_WEIGHTS.items())
+
+# Raw effect type_code -> output key for effects that carry a plain value ('v')
+EFFECT_KEY_MAP = {
+    "sp": "speed",
+    "st": "stamina",
+    "po": "power",
+    "gu": "guts",
+    "in": "wit",
+    "en": "energy",
+    "pt": "skill_pts",
+    "bo": "bond",
+}
 
 BASE_URL = "https://gametora.com"
 SUPPORT_BASE_URL = BASE_URL + "/umamusume/supports/"
 CHARACTER_BASE_URL = BASE_URL + "/umamusume/characters/"
 
+# Embedded Next.js page data: <script id="__NEXT_DATA__" type="application/json">{...}</script>
+NEXT_DATA_PATTERN = re.compile(rb'<script[^>]*\sid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+# One pooled session for every page/image request so TLS connections to gametora are reused.
+SESSION = requests.Session()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32))
+SESSION.headers["Connection"] = "keep-alive"
+
 # --------------------------------- Utils ------------------------------------
 def dbg(on: bool, *args, **kwargs):
     if on:
         print(*args, file=sys.stderr, **kwargs)
 
-def load_skill_data(file_path: str, debug: bool) -> Dict[str, str]:
-    """Loads the skills JSON file into a dictionary for quick lookup (ID -> name)."""
-    skill_map: Dict[str, str] = {}
+json_loads = orjson.loads if orjson is not None else json.loads
+
+def load_skill_data(file_path: str, debug: bool) -> Dict[int, str]:
+    """
+    Loads the skills JSON file into a dictionary for quick lookup (ID -> name).
+    Keys are kept as ints so event effect IDs can be looked up without a str() cast.
+    """
+    skill_map: Dict[int, str] = {}
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             data = json.load(f)
             for skill in data:
                 # Assuming the 'id' is a number and 'name' is a string
-                skill_id = str(skill.get("id"))
+                skill_id = skill.get("id")
                 skill_name = skill.get("name")
-                if skill_id and skill_name:
-                    skill_map[skill_id] = skill_name
+                if skill_id is None or not skill_name:
+                    continue
+                try:
+                    skill_map[int(skill_id)] = sys.intern(skill_name)
+                except (TypeError, ValueError):
+                    dbg(debug, f"[DEBUG] Skipping skill with non-numeric ID: {skill_id!r}")
         dbg(debug, f"[DEBUG] Loaded {len(skill_map)} skills from {file_path}.")
     except FileNotFoundError:
         print(f"[WARN] Skill file not found at: {file_path}. Skill IDs will not be translated.", file=sys.stderr)
@@ -63,6 +108,13 @@ def load_skill_data(file_path: str, debug: bool) -> Dict[str, str]:
         
     return skill_map
 
+def skill_name_for_id(skill_map: Dict[int, str], skill_id: Any) -> str:
+    """Translates a raw effect skill ID (int or numeric string) to its name."""
+    try:
+        return skill_map[int(skill_id)]
+    except (KeyError, TypeError, ValueError):
+        return f"Skill ID: {skill_id}"
+
 def load_status_data(file_path: str, debug: bool) -> Dict[str, str]:
     """
     Loads a JSON file containing status effects/buffs/debuffs 
@@ -93,9 +145,55 @@ def load_status_data(file_path: str, debug: bool) -> Dict[str, str]:
         
     return status_map
 
+def download_image(job: Tuple[str, str, str], session: requests.Session) -> bool:
+    """Downloads one (card_slug, image_url, save_path) job. Returns True on success."""
+    card_slug, image_url, save_path = job
+    # Streamed into a side file and renamed once complete, so a failed read never leaves a truncated image
+    tmp_path = save_path + ".part"
+    try:
+        # Stream the body straight to disk in 64 KB chunks instead of buffering it whole
+        with session.get(image_url, timeout=10, stream=True) as img_response:
+            img_response.raise_for_status()
+            img_response.raw.decode_content = True
+
+            with open(tmp_path, 'wb') as f:
+                shutil.copyfileobj(img_response.raw, f, length=64 * 1024)
+        os.replace(tmp_path, save_path)
+        print(f"[INFO] Downloaded image to: {save_path}")
+        return True
+
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        print(f"[WARN] Failed to download image for {card_slug} from {image_url}: {e}", file=sys.stderr)
+        return False
+
+    finally:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+# ------------------------------ HTTP Cache ----------------------------------
+
+def fetch_page(cache: ConditionalCache, session: requests.Session, url: str, timeout: float) -> bytes:
+    """GETs `url` (raising requests exceptions like raise_for_status) and returns the body."""
+    cached_path, headers = cache.lookup(url)
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached_path:
+        try:
+            with open(cached_path, "rb") as f:
+                body = f.read()
+            dbg(cache.debug, f"[DEBUG] Not modified, using cached copy: {url}")
+            return body
+        except OSError as e:
+            print(f"[WARN] Could not read cached copy of {url}, re-downloading: {e}", file=sys.stderr)
+            response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    cache.store(url, response, io.BytesIO(response.content))
+    return response.content
+
 # -------------------------- Parsing Helpers ---------------------------------
 
-def parse_effects_from_event_dict(event_dict: Dict[str, Any], skill_map: Dict[str, str], status_map: Dict[str, str]) -> List[Dict[str, Any]]:
+def parse_effects_from_event_dict(event_dict: Dict[str, Any], skill_map: Dict[int, str], status_map: Dict[str, str]) -> List[Dict[str, Any]]:
     """
     Parses the effects dictionary ('r' list) from the raw JSON structure
     into a LIST of flat dictionaries of stats/effects, translating skill IDs to names.
@@ -106,10 +204,15 @@ def parse_effects_from_event_dict(event_dict: Dict[str, Any], skill_map: Dict[st
     outcomes: List[Dict[str, Any]] = []
     # Initialize the first outcome dictionary
     current_eff: Dict[str, Any] = {}
+    # The current outcome's 'hints' list, kept as a local once created (no setdefault per hint)
+    hints: Optional[List[str]] = None
+    # Bound methods/globals hoisted into locals for the per-item loop
+    effect_key_for = EFFECT_KEY_MAP.get
     
     # Iterate through all raw effect items
     for item in event_dict.get('r', []):
-        type_code = item.get('t')
+        get = item.get
+        type_code = get('t')
         
         if type_code == 'di':
             # 'di' separator: finalize the current outcome and start a new one
@@ -119,60 +222,54 @@ def parse_effects_from_event_dict(event_dict: Dict[str, Any], skill_map: Dict[st
                 outcomes.append(current_eff)
             
             current_eff = {} # Start a new, empty outcome dictionary
+            hints = None
             continue # Skip to the next item
             
-        value = item.get('v')
-
-        if type_code == 'sp':
-            current_eff['speed'] = value
-        elif type_code == 'st':
-            current_eff['stamina'] = value
-        elif type_code == 'po':
-            current_eff['power'] = value
-        elif type_code == 'gu':
-            current_eff['guts'] = value
-        elif type_code == 'in':
-            current_eff['wit'] = value
-        elif type_code == 'en':
-            current_eff['energy'] = value
-        elif type_code == 'pt':
-            current_eff['skill_pts'] = value
-        elif type_code == 'bo':
-            current_eff['bond'] = value
+        value = get('v')
+
+        # Plain stat/value effects resolve with a single table lookup
+        effect_key = effect_key_for(type_code)
+        if effect_key is not None:
+            current_eff[effect_key] = value
         elif type_code == 'sk': # Skill: translate ID to name
-            skill_id = str(item.get('d', ''))
+            skill_id = get('d', '')
             # **TRANSLATE SKILL ID HERE**
-            skill_name = skill_map.get(skill_id, f"Skill ID: {skill_id}")
-            current_eff.setdefault('hints', []).append(f"{skill_name} ({value})")
+            skill_name = skill_name_for_id(skill_map, skill_id)
+            if hints is None:
+                hints = current_eff['hints'] = []
+            hints.append(f"{skill_name} ({value})")
         # --- Handle 'sr' (Skill Roll) type code which has nested data ---
-        if type_code == 'sr':
+        elif type_code == 'sr':
             # 'sr' structure: nested list of skills in 'd'
-            skills_data = item.get('d', [])
+            skills_data = get('d', [])
             skill_names = []
             
             for skill_item in skills_data:
-                skill_id = str(skill_item.get('d', ''))
+                skill_id = skill_item.get('d', '')
                 value = skill_item.get('v')
 
                 # Translate skill ID
-                skill_name = skill_map.get(skill_id, f"Skill ID: {skill_id}")
+                skill_name = skill_name_for_id(skill_map, skill_id)
                 skill_names.append(f"{skill_name} ({value})")
                 
             if skill_names:
                 # Join all skill names with ' / ' and add to hints
                 hint_string = " / ".join(skill_names)
-                current_eff.setdefault('hints', []).append(hint_string)
+                if hints is None:
+                    hints = current_eff['hints'] = []
+                hints.append(hint_string)
         elif type_code == 'ee':
             current_eff.setdefault("chain_end", True)
         elif type_code == 'se': # need to check { "r": true } for random
             # TODO
             # parse status from in_game/status.json
-            status = status_map.get(str(item.get('d')), f"Unknown Status {item.get('d')!r}")
+            status_id = get('d')
+            status = status_map.get(str(status_id), f"Unknown Status {status_id!r}")
             current_eff.setdefault("status", status)
         elif type_code == 'sg': # Skill: translate ID to name
-            skill_id = str(item.get('d', ''))
+            skill_id = get('d', '')
             # **TRANSLATE SKILL ID HERE**
-            skill_name = skill_map.get(skill_id, f"Skill ID: {skill_id}")
+            skill_name = skill_name_for_id(skill_map, skill_id)
             current_eff.setdefault('status', f"Obtain {skill_name}")
         elif type_code == 'ha':
             current_eff.setdefault("status", "Heal all negative status effects")
@@ -199,38 +296,32 @@ def parse_value(value_str: str) -> float:
 
 def score_outcome(eff: Dict[str, Any]) -> float:
     """Calculate a score for an event outcome based on weighted stats."""
-    energy = float(eff.get("energy", 0))
-    stats_sum = 0.0
-    for stat, weight in STAT_WEIGHTS.items():
-        stats_sum += weight * float(parse_value(eff.get(stat, "0")))
-    spts   = float(eff.get("skill_pts", 0))
-    hints  = len(eff.get("hints", []))
-    bond   = float(eff.get("bond", 0))
-    mood   = float(eff.get("mood", 0)) 
+    get = eff.get
+    energy = float(get("energy", 0))
+    stats_sum = sum(weight * parse_value(get(stat, "0")) for stat, weight in STAT_WEIGHT_ITEMS)
+    spts   = float(get("skill_pts", 0))
+    hints  = len(get("hints", ()))
+    bond   = float(get("bond", 0))
+    mood   = float(get("mood", 0)) 
     
     return (W_ENERGY*energy + W_STAT*stats_sum + W_SKILLPTS*spts +
             W_HINT*hints + W_BOND*bond + W_MOOD*mood)
 
 def choose_default_preference(options: Dict[str, List[Dict[str, Any]]]) -> int:
     """Choose the best option using WORST-CASE scoring for each option."""
-    best_key = 1
-    best_score = float("-inf")
-    for k, outs in options.items():
-        if not outs:
-            continue
-        # Use minimum score (worst case) for this option
-        worst_case = min(score_outcome(o) for o in outs)
-        
-        # Tie-breaker for same score: prefer lower option number (1 > 2 > 3)
-        current_key = int(k) if str(k).isdigit() else 1
-        if worst_case > best_score or (worst_case == best_score and current_key < best_key):
-            best_score = worst_case
-            best_key = current_key
-    return best_key
+    # (worst-case score, option number) per option; the option number is parsed once here
+    candidates = [
+        (min(map(score_outcome, outs)), int(k) if str(k).isdigit() else 1)
+        for k, outs in options.items() if outs
+    ]
+    if not candidates:
+        return 1
+    # Highest worst case wins; tie-breaker for same score: prefer lower option number (1 > 2 > 3)
+    return min(candidates, key=lambda c: (-c[0], c[1]))[1]
 
 # ------------------------------ Event Parsing -------------------------------
 
-def parse_events_from_json_data(event_data: Dict[str, Any], debug: bool, skill_map: Dict[str, str], status_map: Dict[str, str], period: str) -> List[Dict[str, Any]]:
+def parse_events_from_json_data(event_data: Dict[str, Any], debug: bool, skill_map: Dict[int, str], status_map: Dict[str, str], period: str) -> List[Dict[str, Any]]:
     """
     Parses event data from the 'eventData' dictionary in the Next.js JSON.
     """
@@ -242,7 +333,7 @@ def parse_events_from_json_data(event_data: Dict[str, Any], debug: bool, skill_m
         lang = 'ja'
         
     try:
-        events_struct = json.loads(event_data.get(lang, '{}'))
+        events_struct = json_loads(event_data.get(lang, '{}'))
     except json.JSONDecodeError:
         dbg(debug, f"[ERROR] Could not decode '{lang}' event data JSON string.")
         return out
@@ -336,6 +427,20 @@ def parse_events_from_json_data(event_data: Dict[str, Any], debug: bool, skill_m
         
     return out
 
+# --------------------------- Process Pool Workers ---------------------------
+
+# Lookup tables/options of a parse worker process, installed once by init_parse_worker
+_PARSE_WORKER_CONTEXT: Dict[str, Any] = {}
+
+def init_parse_worker(skill_map: Dict[int, str], status_map: Dict[str, str], debug: bool, period: str) -> None:
+    """ProcessPoolExecutor initializer: ships the lookups to each worker once, not per card."""
+    _PARSE_WORKER_CONTEXT.update(skill_map=skill_map, status_map=status_map, debug=debug, period=period)
+
+def parse_events_worker(event_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Parses one card's 'eventData' inside a worker process."""
+    ctx = _PARSE_WORKER_CONTEXT
+    return parse_events_from_json_data(event_data, ctx["debug"], ctx["skill_map"], ctx["status_map"], ctx["period"])
+
 # ---------------------------------- Main ------------------------------------
 def main():
     ap = argparse.ArgumentParser(description="Scrape and parse Umamusume support card event data.")
@@ -346,6 +451,10 @@ def main():
     ap.add_argument("--period", type=str, default="", help="Event period filter (e.g., pre_first_anni)")
     ap.add_argument("--out", default="supports_events.json", help="Output JSON file (array of support card objects)")
     ap.add_argument("--img-dir", default="images", help="Directory to save downloaded card images")
+    ap.add_argument("--workers", type=int, default=8, help="Number of cards fetched concurrently")
+    ap.add_argument("--parse-workers", type=int, default=0, help="Processes used to parse card events after fetching (0/1 = parse in the fetch threads)")
+    ap.add_argument("--cache-dir", default=".cache", help="Directory for ETag/Last-Modified cached pages (default: %(default)s)")
+    ap.add_argument("--no-cache", action="store_true", help="Always re-download pages instead of revalidating the cache")
     ap.add_argument("--debug", action="store_true", help="Enable verbose debug prints to stderr")
     args = ap.parse_args()
 
@@ -368,25 +477,20 @@ def main():
         return
 
     all_supports: List[Dict[str, Any]] = []
+    page_cache = ConditionalCache(None if args.no_cache else args.cache_dir, args.debug)
+    # (support_obj, name, event_data) for cards whose events are parsed in the process pool
+    pending_events: List[Tuple[Dict[str, Any], str, Dict[str, Any]]] = []
+    # Images download on their own pool while the remaining card pages are still being fetched
+    image_executor = ThreadPoolExecutor(max_workers=16)
+    image_downloads: List[Future] = []
 
     img_dir_path = args.img_dir
     
-    # Clear existing content in the image directory
+    # Clear existing content in the image directory (recreated empty in one go)
     if os.path.exists(img_dir_path):
         print(f"[INFO] Clearing existing content in {img_dir_path}...")
-        for item in os.listdir(img_dir_path):
-            item_path = os.path.join(img_dir_path, item)
-            try:
-                if os.path.isfile(item_path) or os.path.islink(item_path):
-                    os.unlink(item_path)  # Delete files and symlinks
-                elif os.path.isdir(item_path):
-                    shutil.rmtree(item_path)  # Delete subdirectories
-            except Exception as e:
-                print(f"[WARN] Failed to delete {item_path}. Reason: {e}", file=sys.stderr)
-
-    # Create image directory if it doesn't exist
-    if not os.path.exists(args.img_dir):
-        os.makedirs(args.img_dir)
+    shutil.rmtree(img_dir_path, ignore_errors=True)
+    os.makedirs(img_dir_path, exist_ok=True)
 
     # Mapping of raw type/attribute values to desired acronyms
     ATTRIBUTE_MAP = {
@@ -398,145 +502,163 @@ def main():
         "friend": "PAL",
     }
 
-    # Regex pattern for the image class prefix
-    SUPPORT_IMG_CLASS_PATTERN = re.compile(r"^supports_infobox_top_image__")
-    CHARACTER_IMG_CLASS_PATTERN = re.compile(r"^characters_infobox_character_image__")
+    # CSS selectors for the image class prefix (hashed suffix changes across deploys)
+    SUPPORT_IMG_SELECTOR = "img[class^='supports_infobox_top_image__'], img[class*=' supports_infobox_top_image__']"
+    CHARACTER_IMG_SELECTOR = "div[class^='characters_infobox_character_image__'], div[class*=' characters_infobox_character_image__']"
 
-    def extract_cards(cards: List[Any], card_type: str):
-        for card_slug in cards:
-            url = SUPPORT_BASE_URL + card_slug
-            if card_type == "trainee":
-                url = CHARACTER_BASE_URL + card_slug
-            dbg(args.debug, f"[DEBUG] Fetching URL: {url}")
-            
-            try:
-                response = requests.get(url, timeout=15)
-                response.raise_for_status()
-            except requests.exceptions.RequestException as e:
-                print(f"[WARN] Failed to fetch {card_slug}: {e}", file=sys.stderr)
-                continue
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # --- JSON DATA EXTRACTION ---
-            
-            next_data_tag = soup.find(id="__NEXT_DATA__")
-
-            if not next_data_tag:
-                print(f"[WARN] Could not find __NEXT_DATA__ tag for {card_slug}.", file=sys.stderr)
-                continue
-            
-            try:
-                json_content = next_data_tag.decode_contents()
-                data = json.loads(json_content)
+    def extract_card(card_slug: str, card_type: str) -> Optional[Dict[str, Any]]:
+        url = SUPPORT_BASE_URL + card_slug
+        if card_type == "trainee":
+            url = CHARACTER_BASE_URL + card_slug
+        dbg(args.debug, f"[DEBUG] Fetching URL: {url}")
+        
+        try:
+            page_content = fetch_page(page_cache, SESSION, url, timeout=15)
+        except requests.exceptions.RequestException as e:
+            print(f"[WARN] Failed to fetch {card_slug}: {e}", file=sys.stderr)
+            return None
+        
+        # --- JSON DATA EXTRACTION ---
+        
+        # The Next.js payload is pulled straight from the raw bytes, no parse tree needed
+        next_data_match = NEXT_DATA_PATTERN.search(page_content)
 
-                page_props = data['props']['pageProps']
-                item_data = page_props['itemData']
-                event_data = page_props['eventData']
-                
-                # Extract basic card metadata
-                name = item_data.get("char_name", "Unknown")
-                if card_type == "trainee":
-                    name = item_data.get("name_en", "Unknown")
-                rarity_code = item_data.get("rarity")
-                if rarity_code == 3:
-                    rarity = "SSR"
-                elif rarity_code == 2:
-                    rarity = "SR"
-                elif rarity_code == 1:
-                    rarity = "R"
-
-                version = item_data.get("version", None)
-                
-                # Get the raw type (e.g., 'speed', 'friend') and convert it using the map
-                raw_attribute = item_data.get("type", "unknown").lower()
-                attribute = ATTRIBUTE_MAP.get(raw_attribute, raw_attribute.upper())
-                
-                # **1. Calculate formatted_id**
-                formatted_id = f"{name}_{attribute}_{rarity}"
-                if card_type == "trainee":
-                    formatted_id = f"{name}_profile"
-                    if version:
-                        formatted_id = f"{name} ({version.replace('_', ' ').title()})_profile"
-                
-                dbg(args.debug, f"[DEBUG] Successfully extracted JSON for: {name}")
+        if not next_data_match:
+            print(f"[WARN] Could not find __NEXT_DATA__ tag for {card_slug}.", file=sys.stderr)
+            return None
+        
+        try:
+            data = json_loads(next_data_match.group(1))
 
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"[ERROR] Failed to parse JSON or access keys for {card_slug}: {e}", file=sys.stderr)
-                continue
-            
-            # --- JSON DATA EXTRACTION END ---
+            page_props = data['props']['pageProps']
+            item_data = page_props['itemData']
+            event_data = page_props['eventData']
             
+            # Extract basic card metadata
+            name = item_data.get("char_name", "Unknown")
+            if card_type == "trainee":
+                name = item_data.get("name_en", "Unknown")
+            rarity_code = item_data.get("rarity")
+            if rarity_code == 3:
+                rarity = "SSR"
+            elif rarity_code == 2:
+                rarity = "SR"
+            elif rarity_code == 1:
+                rarity = "R"
+
+            version = item_data.get("version", None)
             
-            # --- IMAGE FIND & DOWNLOAD LOGIC START ---
+            # Get the raw type (e.g., 'speed', 'friend') and convert it using the map
+            raw_attribute = item_data.get("type", "unknown").lower()
+            attribute = ATTRIBUTE_MAP.get(raw_attribute, raw_attribute.upper())
             
-            image_tag = soup.find("img", class_=SUPPORT_IMG_CLASS_PATTERN)
+            # **1. Calculate formatted_id**
+            formatted_id = f"{name}_{attribute}_{rarity}"
             if card_type == "trainee":
-                image_tag = soup.find("div", class_=CHARACTER_IMG_CLASS_PATTERN)
-                # find img inside the div
+                formatted_id = f"{name}_profile"
+                if version:
+                    formatted_id = f"{name} ({version.replace('_', ' ').title()})_profile"
+            
+            dbg(args.debug, f"[DEBUG] Successfully extracted JSON for: {name}")
+
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"[ERROR] Failed to parse JSON or access keys for {card_slug}: {e}", file=sys.stderr)
+            return None
+        
+        # --- JSON DATA EXTRACTION END ---
+        
+        
+        # --- IMAGE FIND & DOWNLOAD LOGIC START ---
+        
+        soup = BeautifulSoup(page_content, 'lxml')
+        if card_type == "trainee":
+            image_tag = soup.select_one(CHARACTER_IMG_SELECTOR)
+            # find img inside the div
+            if image_tag:
+                image_tag = image_tag.find("span")
+                # find img inside the span
                 if image_tag:
-                    image_tag = image_tag.find("span")
-                    # find img inside the span
-                    if image_tag:
-                        image_tag = image_tag.find("img")
-            image_url = None
-            filename = None
+                    image_tag = image_tag.find("img")
+        else:
+            image_tag = soup.select_one(SUPPORT_IMG_SELECTOR)
+        image_url = None
+        filename = None
+        
+        if image_tag and image_tag.get('src'):
+            raw_src = image_tag['src']
             
-            if image_tag and image_tag.get('src'):
-                raw_src = image_tag['src']
-                
-                # Use safe concatenation (casting to str and handling leading slash)
-                cleaned_src = str(raw_src).lstrip('/')
-                image_url = BASE_URL + '/' + cleaned_src
+            # Use safe concatenation (casting to str and handling leading slash)
+            cleaned_src = str(raw_src).lstrip('/')
+            image_url = BASE_URL + '/' + cleaned_src
 
-                dbg(args.debug, f"[DEBUG] Found image URL: {image_url}")
-                
-                # 2. Construct the file path and name using the formatted_id
-                ext = os.path.splitext(image_url.split('?')[0])[-1]
-                
-                # **2. Use formatted_id as the base filename**
-                filename = formatted_id + ext 
-                subfolder_path = os.path.join(args.img_dir, card_type)
-                save_path = os.path.join(subfolder_path, filename)
-
-                # ***2. Create the directory if it doesn't exist
-                if not os.path.exists(subfolder_path):
-                    os.makedirs(subfolder_path)
-                
-                # 3. Download the image
-                try:
-                    img_response = requests.get(image_url, timeout=10)
-                    img_response.raise_for_status()
-                    
-                    with open(save_path, 'wb') as f:
-                        f.write(img_response.content)
-                    print(f"[INFO] Downloaded image to: {save_path}")
-                    
-                except requests.exceptions.RequestException as e:
-                    print(f"[WARN] Failed to download image for {card_slug} from {image_url}: {e}", file=sys.stderr)
+            dbg(args.debug, f"[DEBUG] Found image URL: {image_url}")
+            
+            # 2. Construct the file path and name using the formatted_id
+            ext = os.path.splitext(image_url.split('?')[0])[-1]
             
-            # --- IMAGE FIND & DOWNLOAD LOGIC END ---
+            # **2. Use formatted_id as the base filename**
+            filename = formatted_id + ext 
+            subfolder_path = os.path.join(args.img_dir, card_type)
+            save_path = os.path.join(subfolder_path, filename)
+
+            # ***2. Create the directory if it doesn't exist (workers may race here)
+            os.makedirs(subfolder_path, exist_ok=True)
             
-            # Process events - **PASS SKILL LOOKUP DICTIONARY**
+            # 3. Hand the image to the download pool right away
+            image_downloads.append(image_executor.submit(download_image, (card_slug, image_url, save_path), SESSION))
+        
+        # --- IMAGE FIND & DOWNLOAD LOGIC END ---
+        
+        # Process events - **PASS SKILL LOOKUP DICTIONARY**
+        events = None
+        if args.parse_workers <= 1:
             events = parse_events_from_json_data(event_data, args.debug, skill_lookup, status_lookup, args.period)
 
-            support_obj = {
-                "type": "support" if card_type == "support" else "trainee",
-                "name": name if card_type == "support" else f"{name} ({version.replace('_', ' ').title()})" if version else name,
-                "rarity": rarity if card_type == "support" else "None",
-                "attribute": attribute if card_type == "support" else "None",
-                "choice_events": events
-            }
-            all_supports.append(support_obj)
+        support_obj = {
+            "type": "support" if card_type == "support" else "trainee",
+            "name": name if card_type == "support" else f"{name} ({version.replace('_', ' ').title()})" if version else name,
+            "rarity": rarity if card_type == "support" else "None",
+            "attribute": attribute if card_type == "support" else "None",
+            "choice_events": events
+        }
+        if events is None:
+            # Parsed later in the process pool (--parse-workers)
+            pending_events.append((support_obj, name, event_data))
+        else:
             print(f"[INFO] Parsed support card: {name} ({len(events)} events)")
+        return support_obj
+
+    def extract_cards(cards: List[str], card_type: str):
+        # Cards are network-bound, so fetch them concurrently; map() keeps the input order.
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            for support_obj in executor.map(lambda slug: extract_card(slug, card_type), cards):
+                if support_obj is not None:
+                    all_supports.append(support_obj)
         
     extract_cards(supported_cards, "support")
 
     extract_cards(character_cards, "trainee")
+    page_cache.save()
+
+    # CPU-bound event parsing spread across processes; image downloads keep running meanwhile
+    if pending_events:
+        with ProcessPoolExecutor(
+            max_workers=args.parse_workers,
+            initializer=init_parse_worker,
+            initargs=(skill_lookup, status_lookup, args.debug, args.period),
+        ) as executor:
+            parsed = executor.map(parse_events_worker, [event_data for _, _, event_data in pending_events])
+            for (support_obj, name, _), events in zip(pending_events, parsed):
+                support_obj["choice_events"] = events
+                print(f"[INFO] Parsed support card: {name} ({len(events)} events)")
+
+    # Wait for the image downloads still in flight (re-raises anything unexpected)
+    image_executor.shutdown(wait=True)
+    for download in image_downloads:
+        download.result()
 
     # --- Final Output ---
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(all_supports, f, ensure_ascii=False, indent=2)
+    write_json_array(args.out, all_supports)
 
     print(f"[OK] Wrote {len(all_supports)} support card entries → {args.out}")
 
@@ -38,6 +38,11 @@ from typing import Optional, Tuple
 import requests
 from bs4 import BeautifulSoup, Tag
 
+try:
+    import orjson  # optional: faster output encoding for the default indent
+except ImportError:
+    orjson = None
+
 BASE_URL = "https://gametora.com"
 
 # Known color/rarity mapping (best-effort; hashed class may change across deploys).
@@ -189,10 +194,18 @@ def main():
     html = fetch_or_read(args.url, args.html_file)
     skills = parse_html_skills(html)
 
-    Path(args.out).write_text(
-        json.dumps(skills, ensure_ascii=False, indent=args.indent),
-        encoding="utf-8"
-    )
+    if orjson is not None and args.indent == 2:
+        # orjson only supports a 2-space indent; anything else goes through stdlib json.
+        # Written as text so line endings match the stdlib path (CRLF on Windows).
+        Path(args.out).write_text(
+            orjson.dumps(skills, option=orjson.OPT_INDENT_2).decode("utf-8"),
+            encoding="utf-8"
+        )
+    else:
+        Path(args.out).write_text(
+            json.dumps(skills, ensure_ascii=False, indent=args.indent),
+            encoding="utf-8"
+        )
 
     print(f"[OK] Extracted {len(skills)} skills → {args.out}")
     # print a couple of examples
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+"""
+Helpers shared by the gametora scrapers in this folder (scrape_supports.py,
+scrape_skills.py). The scripts are run from here, so they import it directly:
+
+  from scraper_common import ConditionalCache, write_json_array
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Tuple
+
+import requests
+
+try:
+    import orjson  # optional: C encoder/decoder, falls back to stdlib json
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _dbg(on: bool, *args, **kwargs):
+    if on:
+        print(*args, file=sys.stderr, **kwargs)
+
+# ------------------------------ JSON Output ---------------------------------
+
+def encode_json_record(record: Any) -> bytes:
+    """Encodes one record as UTF-8 JSON indented by 2 (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    return json.dumps(record, ensure_ascii=False, indent=2).encode("utf-8")
+
+def write_json_array(file_path: str, records: Iterable[Any]) -> None:
+    """
+    Writes `records` as a UTF-8 JSON array indented by 2 (orjson when installed).
+    Each record is encoded and written on its own, so only one record's bytes are
+    buffered at a time; the output matches json.dump(records, indent=2) written in
+    text mode, including the platform line ending (CRLF on Windows).
+    """
+    newline = os.linesep.encode("ascii")
+    indent = newline + b"  "
+    with open(file_path, "wb") as f:
+        f.write(b"[")
+        separator = indent
+        for record in records:
+            f.write(separator)
+            # Encoded JSON never contains a raw newline inside a string, so this only re-indents
+            f.write(encode_json_record(record).replace(b"\n", indent))
+            separator = b"," + indent
+        f.write(b"]" + newline if separator is indent else newline + b"]" + newline)
+
+# ------------------------------ HTTP Cache ----------------------------------
+
+class ConditionalCache:
+    """
+    Revalidates previously fetched URLs with If-None-Match / If-Modified-Since.
+
+    The index (url -> etag, last_modified, path) lives in <cache_dir>/etag.json and
+    each cached body is stored next to it. Bodies are written to a temp file and only
+    moved into place once complete, so an interrupted download never leaves a
+    truncated copy behind a stale validator. Filesystem errors print a warning and
+    turn the cache off for the rest of the run; the fetched body is still used.
+    Passing cache_dir=None disables caching.
+    """
+
+    def __init__(self, cache_dir: Optional[str], debug: bool):
+        self.cache_dir = cache_dir
+        self.debug = debug
+        self.index_path = os.path.join(cache_dir, "etag.json") if cache_dir else ""
+        self._entries: Dict[str, Dict[str, Optional[str]]] = {}
+        self._lock = threading.Lock()  # card workers update the index concurrently
+        self._dirty = False
+        if not cache_dir:
+            return
+        try:
+            with open(self.index_path, "rb") as f:
+                entries = _json_loads(f.read())
+            if not isinstance(entries, dict):
+                raise ValueError("expected a JSON object")
+            self._entries = entries
+            _dbg(debug, f"[DEBUG] Loaded {len(self._entries)} cache entries from {self.index_path}.")
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"[WARN] Ignoring unreadable cache index {self.index_path}: {e}", file=sys.stderr)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.cache_dir)
+
+    def lookup(self, url: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """Returns (cached body path, conditional request headers), or (None, {}) if not cached."""
+        if not self.cache_dir:
+            return None, {}
+        with self._lock:
+            meta = self._entries.get(url)
+        if not meta or not meta.get("path") or not os.path.exists(meta["path"]):
+            return None, {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return (meta["path"], headers) if headers else (None, {})
+
+    def store(self, url: str, response: requests.Response, source: BinaryIO) -> Optional[str]:
+        """
+        Copies `source` (the body of `response`) into the cache and records its validators.
+        Returns the cached path, or None if the response has no validators or the cache
+        could not be written. Errors reading `source` itself propagate to the caller.
+        """
+        with self._lock:
+            # A fresh body supersedes whatever was cached for this URL
+            if self._entries.pop(url, None) is not None:
+                self._dirty = True
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not self.cache_dir or not (etag or last_modified):
+            return None
+
+        path = os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".body")
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(source, f, length=64 * 1024)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except OSError as e:
+            self._disable(e)
+            return None
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+        with self._lock:
+            self._entries[url] = {"etag": etag, "last_modified": last_modified, "path": path}
+            self._dirty = True
+        _dbg(self.debug, f"[DEBUG] Cached {url} -> {path}")
+        return path
+
+    def save(self) -> None:
+        """Persists the index if any entry changed during this run."""
+        if not self.cache_dir or not self._dirty:
+            return
+        with self._lock:
+            payload = json.dumps(self._entries, ensure_ascii=False, indent=2)
+            self._dirty = False
+        try:
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            self._disable(e)
+            return
+        _dbg(self.debug, f"[DEBUG] Saved cache index to {self.index_path}.")
+
+    def _disable(self, error: OSError) -> None:
+        if self.cache_dir:
+            print(f"[WARN] Could not write cache in {self.cache_dir}, caching disabled for this run: {error}", file=sys.stderr)
+        self.cache_dir = None
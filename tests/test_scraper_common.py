@@ -0,0 +1,201 @@
+# tests/test_scraper_common.py
+from __future__ import annotations
+
+import http.server
+import io
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+import urllib3
+
+# The gametora scrapers import their shared helpers as a top-level module from datasets/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "datasets"))
+
+import scraper_common  # noqa: E402
+from scraper_common import ConditionalCache, write_json_array  # noqa: E402
+
+
+RECORDS = [
+    {"name": "Sweep Tosser ◎", "hints": ["Corner Adept ○ (+1)"], "nested": {"a": [], "b": {}}},
+    {"name": "line\nbreak", "value": 1.5, "missing": None},
+]
+
+
+def _text_mode_dump(path: Path, records) -> bytes:
+    """What the scrapers wrote before streaming: json.dump in text mode plus a newline."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("records", [RECORDS, []], ids=["records", "empty"])
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_write_json_array_matches_text_mode_json_dump(tmp_path, monkeypatch, records, use_orjson):
+    """Streamed output is byte-identical to json.dump(indent=2) with either encoder."""
+    if use_orjson and scraper_common.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(scraper_common, "orjson", None)
+
+    out = tmp_path / "out.json"
+    write_json_array(str(out), iter(records))
+    assert out.read_bytes() == _text_mode_dump(tmp_path / "ref.json", records)
+
+
+def test_write_json_array_uses_platform_line_ending(tmp_path, monkeypatch):
+    """Lines end with os.linesep, like the text-mode writes they replaced."""
+    monkeypatch.setattr(scraper_common.os, "linesep", "\r\n")
+    out = tmp_path / "out.json"
+    write_json_array(str(out), RECORDS)
+
+    data = out.read_bytes()
+    assert data.count(b"\r\n") == data.count(b"\n")
+    assert json.loads(data) == RECORDS
+
+
+# ----------------------------
+# ConditionalCache
+# ----------------------------
+BODY = json.dumps([{"id": i, "name": f"Skill {i}"} for i in range(2000)]).encode("utf-8")
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Serves BODY, with an ETag when `etag` is set, answering 304 to a matching If-None-Match."""
+
+    etag = '"v1"'
+    requests: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests.append(self.headers.get("If-None-Match"))
+        if self.etag and self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.etag:
+            self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server; yields (url, handler class) so tests can tweak the ETag and see requests."""
+    handler = type("Handler", (_Handler,), {"requests": []})
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}/skills.json", handler
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def scrape_skills():
+    return pytest.importorskip("scrape_skills")
+
+
+def _read(stream) -> bytes:
+    try:
+        return stream.read()
+    finally:
+        stream.close()
+
+
+def _leftover_temp_files(cache_dir: Path) -> list:
+    return [p.name for p in cache_dir.iterdir() if p.name.endswith(".tmp")] if cache_dir.exists() else []
+
+
+def test_open_skills_json_revalidates_cached_body(tmp_path, server, scrape_skills):
+    """A cached body is reopened on a 304 in a later run."""
+    url, handler = server
+    cache_dir = tmp_path / "cache"
+
+    assert _read(scrape_skills.open_skills_json(url, ConditionalCache(str(cache_dir), False), False)) == BODY
+    assert _read(scrape_skills.open_skills_json(url, ConditionalCache(str(cache_dir), False), False)) == BODY
+
+    assert handler.requests == [None, '"v1"']
+    assert _leftover_temp_files(cache_dir) == []
+
+
+def test_open_skills_json_without_validators_is_not_cached(tmp_path, server, scrape_skills):
+    """No ETag/Last-Modified: the body streams straight off the response and nothing is cached."""
+    url, handler = server
+    handler.etag = None
+    cache_dir = tmp_path / "cache"
+    cache = ConditionalCache(str(cache_dir), False)
+
+    assert _read(scrape_skills.open_skills_json(url, cache, False)) == BODY
+
+    assert cache.enabled
+    assert cache.lookup(url) == (None, {})
+    assert not cache_dir.exists() or not any(p.suffix == ".body" for p in cache_dir.iterdir())
+
+
+def test_open_skills_json_refetches_when_cache_write_fails_mid_stream(tmp_path, server, scrape_skills, monkeypatch, capsys):
+    """A failed cache write warns, disables the cache and re-downloads the body uncached."""
+    url, handler = server
+    cache_dir = tmp_path / "cache"
+    cache = ConditionalCache(str(cache_dir), False)
+
+    def copy_then_fail(src, dst, length=0):
+        dst.write(src.read(1024))
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(scraper_common.shutil, "copyfileobj", copy_then_fail)
+
+    assert _read(scrape_skills.open_skills_json(url, cache, False)) == BODY
+
+    assert not cache.enabled
+    assert handler.requests == [None, None]
+    assert "caching disabled" in capsys.readouterr().err
+    assert _leftover_temp_files(cache_dir) == []
+    assert not (cache_dir / "etag.json").exists()
+
+
+def test_store_keeps_previous_body_when_source_breaks(tmp_path):
+    """A body that fails part-way never replaces the cached copy or its validator."""
+    url = "https://example.invalid/page"
+    cache_dir = tmp_path / "cache"
+
+    class Response:
+        headers = {"ETag": '"v1"'}
+
+    class BrokenSource:
+        def read(self, size=-1):
+            raise urllib3.exceptions.ProtocolError("Connection broken")
+
+    cache = ConditionalCache(str(cache_dir), False)
+    old_path = cache.store(url, Response(), io.BytesIO(b"old body"))
+    cache.save()
+
+    Response.headers = {"ETag": '"v2"'}
+    with pytest.raises(urllib3.exceptions.ProtocolError):
+        ConditionalCache(str(cache_dir), False).store(url, Response(), BrokenSource())
+
+    assert ConditionalCache(str(cache_dir), False).lookup(url) == (old_path, {"If-None-Match": '"v1"'})
+    assert Path(old_path).read_bytes() == b"old body"
+    assert _leftover_temp_files(cache_dir) == []
+
+
+def test_unwritable_cache_dir_disables_cache(tmp_path, capsys):
+    """Filesystem errors warn once and turn the cache off instead of raising."""
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+
+    class Response:
+        headers = {"ETag": '"v1"'}
+
+    cache = ConditionalCache(str(blocker / "cache"), False)
+    assert cache.store("https://example.invalid/page", Response(), io.BytesIO(b"body")) is None
+    cache.save()
+
+    assert not cache.enabled
+    assert capsys.readouterr().err.count("caching disabled") == 1